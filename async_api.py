@@ -0,0 +1,368 @@
+"""
+asyncio counterpart of PexelsAPI and download_single_image
+
+A single event loop keeps many searches and image transfers in flight without
+tying up an OS thread per request. Retry/backoff behaviour and DownloadStats
+accounting mirror the synchronous client in pexels_core.py.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime
+from itertools import count
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from pexels_core import DownloadStats, MAX_PER_PAGE, PART_SUFFIX, RateLimiter
+from search_cache import SearchCache
+
+# Same policy as the urllib3 Retry mounted on the sync session
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+SEARCH_RETRIES = 3
+SEARCH_BACKOFF_FACTOR = 1
+
+DEFAULT_MAX_CONNECTIONS = 100
+CHUNK_SIZE = 64 * 1024
+
+
+class AsyncRateLimiter(RateLimiter):
+    """The shared token bucket, awaiting its reservation instead of blocking the loop"""
+
+    async def wait_if_needed(self):
+        wait_time = self.reserve()
+        if wait_time > 0:
+            logging.debug(f"Rate limiting: waiting {wait_time:.2f} seconds")
+            await asyncio.sleep(wait_time)
+
+
+class AsyncPexelsAPI:
+    BASE_URL = "https://api.pexels.com/v1"
+
+    def __init__(self, api_key: str, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 cache: Optional[SearchCache] = None):
+        self.api_key = api_key
+        self.headers = {"Authorization": api_key}
+        self.rate_limiter = AsyncRateLimiter()
+        self.max_connections = max_connections
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.stats = DownloadStats()
+        self.cache = cache
+
+    async def __aenter__(self) -> "AsyncPexelsAPI":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def open(self):
+        if self.session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=30)
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def search_photos(self, query: str, per_page: int = MAX_PER_PAGE,
+                            orientation: Optional[str] = None,
+                            size: Optional[str] = None,
+                            color: Optional[str] = None,
+                            locale: Optional[str] = None,
+                            page: int = 1) -> Optional[Dict]:
+
+        params = {
+            "query": query,
+            "per_page": min(per_page, MAX_PER_PAGE)
+        }
+        if page > 1:
+            params['page'] = page
+
+        # Add optional parameters
+        if orientation and orientation in ['landscape', 'portrait', 'square']:
+            params['orientation'] = orientation
+        if size and size in ['large', 'medium', 'small']:
+            params['size'] = size
+        if color:
+            params['color'] = color
+        if locale:
+            params['locale'] = locale
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = SearchCache.make_key(params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.stats.cache_hits += 1
+                logging.info(f"Using cached results for '{query}' with params: {params}")
+                return cached
+            self.stats.cache_misses += 1
+
+        await self.open()
+        await self.rate_limiter.wait_if_needed()
+        self.stats.api_calls += 1
+
+        logging.info(f"Searching for '{query}' with params: {params}")
+
+        for retry in count():
+            try:
+                async with self.session.get(f"{self.BASE_URL}/search",
+                                            headers=self.headers,
+                                            params=params) as response:
+                    self.rate_limiter.update_from_headers(response.headers)
+
+                    if response.status in RETRY_STATUSES and retry < SEARCH_RETRIES:
+                        delay = _retry_delay(response, retry)
+                        logging.warning(f"Search for '{query}' returned {response.status}, "
+                                        f"retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                        continue
+
+                    if response.status == 401:
+                        raise ValueError("Invalid API key")
+                    elif response.status == 429:
+                        retry_after = response.headers.get('Retry-After')
+                        self.rate_limiter.block_for(float(retry_after) if retry_after and retry_after.isdigit() else 60)
+                        raise Exception("Rate limit exceeded. Please wait before making more requests.")
+                    elif response.status >= 400:
+                        raise Exception(f"API error: {response.status} {response.reason}")
+
+                    # Check rate limit headers
+                    remaining = response.headers.get('X-Ratelimit-Remaining')
+                    if remaining and int(remaining) < 10:
+                        logging.warning(f"API rate limit remaining: {remaining}")
+
+                    data = await response.json()
+                    if cache_key is not None:
+                        self.cache.put(cache_key, data)
+                    return data
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if retry < SEARCH_RETRIES:
+                    await asyncio.sleep(SEARCH_BACKOFF_FACTOR * (2 ** retry))
+                    continue
+                raise Exception(f"Network error: {e}")
+
+    async def iter_search_photos(self, query: str, max_results: int,
+                                 orientation: Optional[str] = None,
+                                 size: Optional[str] = None,
+                                 color: Optional[str] = None,
+                                 locale: Optional[str] = None) -> AsyncIterator[Dict]:
+        """Async version of PexelsAPI.iter_search_photos"""
+
+        per_page = min(max_results, MAX_PER_PAGE)
+        page = 1
+        yielded = 0
+
+        while yielded < max_results:
+            data = await self.search_photos(
+                query=query,
+                per_page=per_page,
+                orientation=orientation,
+                size=size,
+                color=color,
+                locale=locale,
+                page=page
+            )
+
+            photos = (data or {}).get("photos") or []
+            if page == 1:
+                logging.info(f"'{query}' has {(data or {}).get('total_results', 0)} results")
+
+            for photo in photos[:max_results - yielded]:
+                yielded += 1
+                yield photo
+
+            total_results = (data or {}).get("total_results", 0)
+            if not photos or not data.get("next_page") or page * per_page >= total_results:
+                break
+            page += 1
+
+
+def _retry_delay(response: aiohttp.ClientResponse, retry: int) -> float:
+    """Honour Retry-After like urllib3 does, otherwise back off exponentially"""
+
+    retry_after = response.headers.get('Retry-After')
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return SEARCH_BACKOFF_FACTOR * (2 ** retry)
+
+
+async def download_single_image(url: str, filename: str, session: aiohttp.ClientSession,
+                                max_retries: int = 3) -> bool:
+    """Async version of pexels_core.download_single_image, with the same .part/Range resume logic"""
+
+    part_filename = filename + PART_SUFFIX
+    attempt = 0
+    furthest = os.path.getsize(part_filename) if os.path.exists(part_filename) else 0
+
+    while True:
+        offset = os.path.getsize(part_filename) if os.path.exists(part_filename) else 0
+        written = 0
+        try:
+            headers = {'Range': f'bytes={offset}-'} if offset else None
+            async with session.get(url, headers=headers, auto_decompress=False) as response:
+                if response.status == 416:
+                    os.remove(part_filename)
+                    raise IOError("Requested range not satisfiable, restarting download")
+                response.raise_for_status()
+
+                if offset and response.status != 206:
+                    offset = 0
+
+                expected_size = _expected_size(response, offset)
+
+                with open(part_filename, 'ab' if offset else 'wb') as f:
+                    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                        f.write(chunk)
+                        written += len(chunk)
+
+            size = offset + written
+            if expected_size is not None and size > expected_size:
+                os.remove(part_filename)
+                raise IOError(f"Received {size} bytes, more than the expected {expected_size}")
+            if expected_size is not None and size < expected_size:
+                raise IOError(f"Incomplete download: got {size} of {expected_size} bytes")
+
+            os.replace(part_filename, filename)
+            logging.debug(f"Successfully downloaded {filename}")
+            return True
+
+        except Exception as e:
+            if offset + written > furthest:
+                furthest = offset + written
+                logging.warning(f"Download of {filename} interrupted after {offset + written} bytes, "
+                                f"resuming: {e}")
+                continue
+
+            attempt += 1
+            logging.warning(f"Attempt {attempt} failed for {filename}: {e}")
+            if attempt < max_retries:
+                await asyncio.sleep(2 ** (attempt - 1))  # Exponential backoff
+            else:
+                logging.error(f"Failed to download {filename} after {max_retries} attempts")
+                return False
+
+
+def _expected_size(response: aiohttp.ClientResponse, offset: int) -> Optional[int]:
+    """Final file size promised by a 200 or 206 response, if the server sent one"""
+
+    if response.status == 206:
+        content_range = response.headers.get('Content-Range', '')
+        try:
+            byte_range, total = content_range.split(' ', 1)[1].split('/')
+            start = int(byte_range.split('-')[0])
+        except (IndexError, ValueError):
+            raise IOError(f"Malformed Content-Range: {content_range!r}")
+        if start != offset:
+            raise IOError(f"Server resumed at byte {start}, expected {offset}")
+        return int(total) if total != '*' else None
+
+    return response.content_length
+
+
+async def download_photos(photos: AsyncIterable[Dict], term_folder: str, api: AsyncPexelsAPI,
+                          max_concurrency: int = DEFAULT_MAX_CONNECTIONS) -> Tuple[int, int, int]:
+    """Download search results as they arrive, with at most max_concurrency transfers at once
+
+    Returns (downloaded, skipped, failed) counts, like pexels_core.download_photos.
+    """
+
+    counts = {"downloaded": 0, "skipped": 0, "failed": 0}
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks: List[asyncio.Task] = []
+
+    async def fetch(img_url, filename):
+        try:
+            ok = await download_single_image(img_url, filename, api.session)
+        finally:
+            semaphore.release()
+
+        # Stats are only touched from the event loop thread, so no locking is needed
+        if ok:
+            counts["downloaded"] += 1
+            api.stats.successful_downloads += 1
+        else:
+            counts["failed"] += 1
+            api.stats.failed_downloads += 1
+
+    try:
+        async for photo in photos:
+            img_id = photo["id"]
+            img_url = photo["src"]["original"]
+
+            img_ext = os.path.splitext(img_url)[1] or '.jpg'
+            filename = os.path.join(term_folder, f"{img_id}{img_ext}")
+
+            if os.path.exists(filename):
+                counts["skipped"] += 1
+                api.stats.skipped_files += 1
+                continue
+
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(fetch(img_url, filename)))
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    return counts["downloaded"], counts["skipped"], counts["failed"]
+
+
+async def download_images(api_key: str, search_terms: List[str], num_images: int,
+                          output_folder: str, orientation: Optional[str] = None,
+                          size: Optional[str] = None, color: Optional[str] = None,
+                          locale: Optional[str] = None,
+                          max_concurrency: int = DEFAULT_MAX_CONNECTIONS) -> DownloadStats:
+    """Search and download every term on one event loop, returning the run's DownloadStats"""
+
+    if not api_key:
+        raise ValueError("API Key is required.")
+    if not search_terms or not output_folder:
+        raise ValueError("Search terms and output folder are required.")
+
+    os.makedirs(output_folder, exist_ok=True)
+
+    async with AsyncPexelsAPI(api_key, max_connections=max_concurrency) as api:
+        api.stats.start_time = datetime.now()
+
+        for term in search_terms:
+            term = term.strip()
+            if not term:
+                continue
+
+            term_folder = os.path.join(output_folder, term.replace('/', '_').replace('\\', '_'))
+            try:
+                os.makedirs(term_folder, exist_ok=True)
+            except Exception as e:
+                logging.error(f"Failed to create folder for '{term}': {e}")
+                continue
+
+            api.stats.total_searches += 1
+
+            try:
+                photos = api.iter_search_photos(
+                    query=term,
+                    max_results=num_images,
+                    orientation=orientation,
+                    size=size,
+                    color=color,
+                    locale=locale
+                )
+                images_downloaded, images_skipped, images_failed = await download_photos(
+                    photos, term_folder, api, max_concurrency=max_concurrency
+                )
+                logging.info(f"Completed '{term}': {images_downloaded} downloaded, "
+                             f"{images_skipped} skipped, {images_failed} failed")
+            except ValueError as e:
+                logging.error(f"Authentication error for '{term}': {e}")
+                break
+            except Exception as e:
+                logging.error(f"Error processing '{term}': {e}")
+
+        return api.stats
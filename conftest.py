@@ -0,0 +1,140 @@
+"""
+Shared pytest fixtures: a local stand-in for the Pexels API and image CDN
+"""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+
+def make_photo(base_url, photo_id, path=None):
+    return {"id": photo_id, "src": {"original": f"{base_url}/{path or photo_id}.jpeg"}}
+
+
+class StubPexelsHandler(BaseHTTPRequestHandler):
+    """Serves /v1/search pages and image bytes from the owning StubPexelsServer"""
+
+    def do_GET(self):
+        stub = self.server.stub
+        with stub.lock:
+            stub.requests.append(self.path)
+
+        if self.path.startswith("/v1/search"):
+            self.send_search(stub)
+        elif self.path.startswith("/missing"):
+            self.send_error(404)
+        else:
+            self.send_image(stub)
+
+    def send_search(self, stub):
+        with stub.lock:
+            status = stub.search_errors.pop(0) if stub.search_errors else None
+        if status:
+            self.send_response(status)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        params = parse_qs(urlparse(self.path).query)
+        page = int(params.get("page", ["1"])[0])
+        per_page = int(params["per_page"][0])
+        with stub.lock:
+            stub.search_pages.append(page)
+
+        first = (page - 1) * per_page + 1
+        ids = range(first, min(first + per_page, stub.total_results + 1))
+        body = {
+            "page": page,
+            "per_page": per_page,
+            "total_results": stub.total_results,
+            "photos": [make_photo(stub.url, i) for i in ids],
+        }
+        if first + per_page <= stub.total_results:
+            body["next_page"] = f"{stub.url}/v1/search?page={page + 1}"
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_image(self, stub):
+        body = stub.image_bytes
+        total = len(body)
+        start = 0
+
+        byte_range = self.headers.get("Range")
+        if byte_range and stub.accept_ranges:
+            start = int(byte_range.split("=")[1].split("-")[0])
+            if start >= total:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{total}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{total - 1}/{total}")
+        else:
+            self.send_response(200)
+
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(total - start))
+        if stub.accept_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        with stub.lock:
+            truncate = stub.truncate_images > 0
+            stub.truncate_images -= truncate
+        if truncate:
+            # Promise the whole body but drop the connection halfway through
+            self.wfile.write(body[start:start + (total - start) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubPexelsServer:
+    def __init__(self, total_results=130, image_size=64 * 1024):
+        self.total_results = total_results
+        self.image_bytes = b"\xff\xd8\xff" + os.urandom(image_size)
+        self.requests = []
+        self.search_pages = []
+        # Statuses returned by the next search requests before normal pages resume
+        self.search_errors = []
+        # Number of upcoming image responses to cut off halfway through
+        self.truncate_images = 0
+        self.accept_ranges = True
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), StubPexelsHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.stub = self
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def photo(self, photo_id, path=None):
+        return make_photo(self.url, photo_id, path)
+
+    def start(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubPexelsServer()
+    server.start()
+    yield server
+    server.stop()
@@ -0,0 +1,226 @@
+"""
+Batch job mode: thousands of search terms from a CSV or JSONL file
+
+Each line of a job file names a term and, optionally, its own image count and
+search filters. Terms are worked on by a small pool of search workers that all
+feed one shared download pool, so a slow or huge term only occupies its own
+search worker while the others keep going. Finished terms are appended to a
+checkpoint log, and a restarted job skips everything already recorded there.
+"""
+
+import csv
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Callable, List, Optional, Set
+
+from manifest import DownloadManifest
+from pexels_core import (DEFAULT_DOWNLOAD_WORKERS, MAX_DOWNLOAD_WORKERS, DownloadStats,
+                         PexelsAPI, ProgressEvent, download_term, format_stats)
+from search_cache import SearchCache, SEARCH_CACHE_FILENAME
+
+CHECKPOINT_FILENAME = ".pexels_job_checkpoint.jsonl"
+DEFAULT_SEARCH_WORKERS = 4
+JOB_FIELDS = ("term", "num_images", "orientation", "size", "color", "locale")
+
+
+@dataclass
+class JobTerm:
+    term: str
+    num_images: int
+    orientation: Optional[str] = None
+    size: Optional[str] = None
+    color: Optional[str] = None
+    locale: Optional[str] = None
+
+    def key(self) -> str:
+        """Identity of this line in the checkpoint log"""
+        return json.dumps(asdict(self), sort_keys=True)
+
+
+def load_job_file(path: str, default_num_images: int = 50) -> List[JobTerm]:
+    """Read job terms from a .jsonl file (one object per line) or a CSV with a header row
+
+    Columns/keys are those of JobTerm; only "term" is required. Blank optional
+    values fall back to no filter and default_num_images.
+    """
+
+    if path.lower().endswith((".jsonl", ".ndjson", ".json")):
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+    jobs = []
+    for line_number, row in enumerate(rows, start=1):
+        unknown = set(row) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"{path}:{line_number}: unknown fields {sorted(unknown)}")
+
+        term = str(row.get("term") or "").strip()
+        if not term:
+            logging.warning(f"{path}:{line_number}: skipping line without a term")
+            continue
+
+        num_images = row.get("num_images")
+        jobs.append(JobTerm(
+            term=term,
+            num_images=int(num_images) if num_images not in (None, "") else default_num_images,
+            orientation=row.get("orientation") or None,
+            size=row.get("size") or None,
+            color=row.get("color") or None,
+            locale=row.get("locale") or None,
+        ))
+    return jobs
+
+
+class JobCheckpoint:
+    """Append-only log of finished job terms
+
+    One JSON line is written and fsynced per finished term, so a crash loses
+    at most the terms that were still in progress.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: Set[str] = set()
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._done.add(json.loads(line)["key"])
+                    except (ValueError, KeyError):
+                        # A torn final line from a crash; the term simply runs again
+                        continue
+
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __contains__(self, job: JobTerm) -> bool:
+        return job.key() in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def mark_done(self, job: JobTerm, downloaded: int, skipped: int, failed: int):
+        entry = {
+            "key": job.key(),
+            "term": job.term,
+            "downloaded": downloaded,
+            "skipped": skipped,
+            "failed": failed,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._done.add(entry["key"])
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def run_job(api_key: str, jobs: List[JobTerm], output_folder: str,
+            max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+            search_workers: int = DEFAULT_SEARCH_WORKERS,
+            checkpoint_path: Optional[str] = None,
+            cache_path: Optional[str] = None,
+            on_progress: Optional[Callable[[ProgressEvent], None]] = None) -> DownloadStats:
+    """Run every job term not yet in the checkpoint and return the run's DownloadStats
+
+    Up to search_workers terms are in progress at once, all submitting to one
+    download pool of max_workers threads. A term is checkpointed once all of
+    its downloads have succeeded; terms with a search error or failed
+    downloads are left out of the checkpoint so the next run retries them. Raises ValueError if
+    the API rejects the key, after the terms already running have drained.
+    """
+
+    if not api_key:
+        raise ValueError("API Key is required.")
+    if not output_folder:
+        raise ValueError("Output folder is required.")
+
+    max_workers = max(1, min(int(max_workers), MAX_DOWNLOAD_WORKERS))
+    search_workers = max(1, int(search_workers))
+    os.makedirs(output_folder, exist_ok=True)
+
+    checkpoint = JobCheckpoint(checkpoint_path or os.path.join(output_folder, CHECKPOINT_FILENAME))
+    pending = [job for job in jobs if job not in checkpoint]
+    logging.info(f"Job has {len(jobs)} terms, {len(jobs) - len(pending)} already done")
+
+    cache = SearchCache(cache_path or os.path.join(output_folder, SEARCH_CACHE_FILENAME))
+    api = PexelsAPI(api_key, pool_size=max_workers + search_workers, cache=cache)
+    api.stats.start_time = datetime.now()
+    manifest = DownloadManifest(output_folder)
+
+    total = len(pending)
+    finished = 0
+    progress_lock = threading.Lock()
+    auth_failed = threading.Event()
+
+    def notify(kind, message, **fields):
+        if on_progress:
+            on_progress(ProgressEvent(kind, message, **fields))
+
+    def run_term(job: JobTerm):
+        nonlocal finished
+        # Once the key is rejected, remaining queued terms return immediately
+        if auth_failed.is_set():
+            return
+
+        notify("term", f"Processing '{job.term}'...", term=job.term)
+        try:
+            counts = download_term(
+                api, job.term, job.num_images, output_folder, download_pool, manifest,
+                orientation=job.orientation, size=job.size, color=job.color, locale=job.locale,
+                max_in_flight=max_workers
+            )
+        except ValueError:
+            auth_failed.set()
+            raise
+        except Exception as e:
+            logging.error(f"Error processing '{job.term}': {e}")
+            notify("error", f"Error processing '{job.term}': {e}", term=job.term)
+            return
+
+        if counts[2]:
+            # Leave the term for the next run; finished images are skipped via the manifest
+            logging.warning(f"'{job.term}' had {counts[2]} failed downloads, not checkpointing")
+        else:
+            checkpoint.mark_done(job, *counts)
+        with progress_lock:
+            finished += 1
+            percent = finished / total * 100
+        notify("term_done", f"Completed '{job.term}'", term=job.term, percent=percent)
+
+    notify("started", f"Starting job with {total} terms...")
+
+    download_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pexels-download")
+    search_pool = ThreadPoolExecutor(max_workers=search_workers, thread_name_prefix="pexels-search")
+    try:
+        futures = [search_pool.submit(run_term, job) for job in pending]
+        # Terms already running drain before an auth error is surfaced
+        wait(futures)
+        for future in futures:
+            if future.exception() is not None:
+                notify("error", f"Authentication error: {future.exception()}")
+                raise future.exception()
+    finally:
+        search_pool.shutdown(wait=True)
+        download_pool.shutdown(wait=True)
+        cache.close()
+        manifest.close()
+        checkpoint.close()
+
+    logging.info(format_stats(api.stats))
+    notify("finished", "Job complete!", percent=100.0)
+    return api.stats
+
@@ -1,18 +1,17 @@
 import tkinter as tk
-import winreg
 from tkinter import filedialog, ttk
 from tkinter import messagebox
-import requests
 import os
 import threading
-import time
 import logging
-from typing import Optional, List, Dict
-from dataclasses import dataclass
-from urllib3.util.retry import Retry
-from requests.adapters import HTTPAdapter
-import json
-from datetime import datetime
+
+import pexels_core
+from pexels_core import DEFAULT_DOWNLOAD_WORKERS, MAX_DOWNLOAD_WORKERS, MAX_IMAGES_PER_TERM
+
+try:
+    import winreg
+except ImportError:  # Settings are only persisted on Windows
+    winreg = None
 
 # Configure logging
 logging.basicConfig(
@@ -24,269 +23,6 @@ logging.basicConfig(
     ]
 )
 
-@dataclass
-class DownloadStats:
-    total_searches: int = 0
-    successful_downloads: int = 0
-    failed_downloads: int = 0
-    skipped_files: int = 0
-    api_calls: int = 0
-    start_time: Optional[datetime] = None
-
-class RateLimiter:
-    def __init__(self, calls_per_minute: int = 50):
-        self.calls_per_minute = calls_per_minute
-        self.min_interval = 60.0 / calls_per_minute
-        self.last_call_time = 0
-
-    def wait_if_needed(self):
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_call_time
-
-        if time_since_last_call < self.min_interval:
-            wait_time = self.min_interval - time_since_last_call
-            logging.debug(f"Rate limiting: waiting {wait_time:.2f} seconds")
-            time.sleep(wait_time)
-
-        self.last_call_time = time.time()
-
-class PexelsAPI:
-    BASE_URL = "https://api.pexels.com/v1"
-
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.headers = {"Authorization": api_key}
-        self.rate_limiter = RateLimiter()
-        self.session = self._create_session()
-        self.stats = DownloadStats()
-
-    def _create_session(self) -> requests.Session:
-        session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        return session
-
-    def search_photos(self, query: str, per_page: int = 80,
-                     orientation: Optional[str] = None,
-                     size: Optional[str] = None,
-                     color: Optional[str] = None,
-                     locale: Optional[str] = None) -> Optional[Dict]:
-
-        self.rate_limiter.wait_if_needed()
-        self.stats.api_calls += 1
-
-        params = {
-            "query": query,
-            "per_page": min(per_page, 80)
-        }
-
-        # Add optional parameters
-        if orientation and orientation in ['landscape', 'portrait', 'square']:
-            params['orientation'] = orientation
-        if size and size in ['large', 'medium', 'small']:
-            params['size'] = size
-        if color:
-            params['color'] = color
-        if locale:
-            params['locale'] = locale
-
-        try:
-            logging.info(f"Searching for '{query}' with params: {params}")
-            response = self.session.get(
-                f"{self.BASE_URL}/search",
-                headers=self.headers,
-                params=params,
-                timeout=30
-            )
-            response.raise_for_status()
-
-            # Check rate limit headers
-            remaining = response.headers.get('X-Ratelimit-Remaining')
-            if remaining and int(remaining) < 10:
-                logging.warning(f"API rate limit remaining: {remaining}")
-
-            return response.json()
-
-        except requests.exceptions.HTTPError as e:
-            if response.status_code == 401:
-                raise ValueError("Invalid API key")
-            elif response.status_code == 429:
-                raise Exception("Rate limit exceeded. Please wait before making more requests.")
-            else:
-                raise Exception(f"API error: {e}")
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Network error: {e}")
-
-def download_images(api_key, search_terms, num_images, output_folder,
-                   status_label, progress_bar, orientation=None,
-                   size=None, color=None, locale=None):
-    """Enhanced image download function with comprehensive error handling and rate limiting"""
-
-    if not api_key:
-        status_label.config(text="Invalid API Key")
-        return
-
-    if not search_terms or not output_folder:
-        messagebox.showerror("Error", "Search terms and output folder are required.")
-        return
-
-    # Initialize API client
-    try:
-        api = PexelsAPI(api_key)
-        api.stats.start_time = datetime.now()
-    except Exception as e:
-        status_label.config(text=f"Failed to initialize API: {e}")
-        return
-
-    # Create output folder if it doesn't exist
-    try:
-        os.makedirs(output_folder, exist_ok=True)
-    except Exception as e:
-        status_label.config(text=f"Failed to create output folder: {e}")
-        return
-
-    status_label.config(text="Starting download process...")
-    progress_bar['value'] = 0
-
-    total_operations = len(search_terms)
-    completed_operations = 0
-
-    for term in search_terms:
-        term = term.strip()
-        if not term:
-            continue
-
-        term_folder = os.path.join(output_folder, term.replace('/', '_').replace('\\', '_'))
-        try:
-            os.makedirs(term_folder, exist_ok=True)
-        except Exception as e:
-            logging.error(f"Failed to create folder for '{term}': {e}")
-            continue
-
-        status_label.config(text=f"Processing '{term}'...")
-        api.stats.total_searches += 1
-
-        try:
-            # Search for photos
-            data = api.search_photos(
-                query=term,
-                per_page=min(num_images, 80),
-                orientation=orientation,
-                size=size,
-                color=color,
-                locale=locale
-            )
-
-            if not data or not data.get("photos"):
-                logging.warning(f"No results found for '{term}'")
-                status_label.config(text=f"No results for '{term}'")
-                completed_operations += 1
-                progress_bar['value'] = (completed_operations / total_operations) * 100
-                continue
-
-            photos = data["photos"]
-            logging.info(f"Found {len(photos)} photos for '{term}'")
-
-            images_downloaded = 0
-            images_skipped = 0
-            images_failed = 0
-
-            for i, photo in enumerate(photos):
-                if images_downloaded >= num_images:
-                    break
-
-                img_id = photo["id"]
-                img_url = photo["src"]["original"]
-
-                # Generate filename
-                img_ext = os.path.splitext(img_url)[1] or '.jpg'
-                filename = os.path.join(term_folder, f"{img_id}{img_ext}")
-
-                # Skip if file already exists
-                if os.path.exists(filename):
-                    images_skipped += 1
-                    api.stats.skipped_files += 1
-                    continue
-
-                # Download image with retry logic
-                if download_single_image(img_url, filename, api.session):
-                    images_downloaded += 1
-                    api.stats.successful_downloads += 1
-                    status_label.config(text=f"Downloaded {images_downloaded} images for '{term}'")
-                else:
-                    images_failed += 1
-                    api.stats.failed_downloads += 1
-
-                # Update progress within term
-                term_progress = ((i + 1) / len(photos)) * 100
-                status_label.config(text=f"Processing '{term}': {term_progress:.1f}%")
-
-            completed_operations += 1
-            progress_bar['value'] = (completed_operations / total_operations) * 100
-
-            # Log results for this term
-            logging.info(f"Completed '{term}': {images_downloaded} downloaded, "
-                        f"{images_skipped} skipped, {images_failed} failed")
-
-        except ValueError as e:
-            status_label.config(text=f"Authentication error: {e}")
-            logging.error(f"Authentication error for '{term}': {e}")
-            break
-        except Exception as e:
-            status_label.config(text=f"Error processing '{term}': {e}")
-            logging.error(f"Error processing '{term}': {e}")
-            completed_operations += 1
-            progress_bar['value'] = (completed_operations / total_operations) * 100
-
-    # Final statistics
-    end_time = datetime.now()
-    duration = end_time - api.stats.start_time if api.stats.start_time else None
-
-    stats_message = (f"Download complete!\n"
-                    f"Searches: {api.stats.total_searches}\n"
-                    f"Downloaded: {api.stats.successful_downloads}\n"
-                    f"Skipped: {api.stats.skipped_files}\n"
-                    f"Failed: {api.stats.failed_downloads}\n"
-                    f"API calls: {api.stats.api_calls}")
-
-    if duration:
-        stats_message += f"\nDuration: {duration.total_seconds():.1f}s"
-
-    status_label.config(text="Download complete!")
-    messagebox.showinfo("Download Complete", stats_message)
-    logging.info(stats_message)
-
-def download_single_image(url: str, filename: str, session: requests.Session,
-                         max_retries: int = 3) -> bool:
-    """Download a single image with retry logic"""
-
-    for attempt in range(max_retries):
-        try:
-            response = session.get(url, stream=True, timeout=30)
-            response.raise_for_status()
-
-            with open(filename, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-
-            logging.debug(f"Successfully downloaded {filename}")
-            return True
-
-        except Exception as e:
-            logging.warning(f"Attempt {attempt + 1} failed for {filename}: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                logging.error(f"Failed to download {filename} after {max_retries} attempts")
-                return False
-
 def create_gui():
     """Create enhanced GUI with additional search parameters and better UX"""
 
@@ -312,6 +48,14 @@ def create_gui():
         color = ""
         locale = ""
 
+    # Stored separately so settings saved by older versions still load
+    try:
+        with winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER) as registry_key:
+            with winreg.OpenKey(registry_key, r"Software\PexelsImageDownloader", 0, winreg.KEY_READ) as key:
+                max_workers = winreg.QueryValueEx(key, "max_workers")[0]
+    except Exception:
+        max_workers = DEFAULT_DOWNLOAD_WORKERS
+
     root = tk.Tk()
     root.title("Enhanced Pexels Image Downloader")
     root.geometry("600x500")
@@ -344,7 +88,8 @@ def create_gui():
     # Number of Images
     ttk.Label(main_frame, text="Images per Term:").grid(row=2, column=0, sticky='w', pady=5)
     num_images_var = tk.IntVar(value=num_images)
-    num_images_spinbox = ttk.Spinbox(main_frame, from_=1, to=80, textvariable=num_images_var, width=10)
+    num_images_spinbox = ttk.Spinbox(main_frame, from_=1, to=MAX_IMAGES_PER_TERM,
+                                     textvariable=num_images_var, width=10)
     num_images_spinbox.grid(row=2, column=1, sticky='w', pady=5)
 
     # Output Folder
@@ -394,6 +139,12 @@ def create_gui():
                                      'ro-RO', 'nb-NO', 'sk-SK', 'tr-TR', 'ru-RU'], width=20)
     locale_combo.grid(row=3, column=1, sticky='w', pady=5)
 
+    ttk.Label(settings_frame, text="Download Workers:").grid(row=4, column=0, sticky='w', pady=5)
+    max_workers_var = tk.IntVar(value=max_workers)
+    max_workers_spinbox = ttk.Spinbox(settings_frame, from_=1, to=MAX_DOWNLOAD_WORKERS,
+                                      textvariable=max_workers_var, width=10)
+    max_workers_spinbox.grid(row=4, column=1, sticky='w', pady=5)
+
     # Buttons frame
     button_frame = ttk.Frame(main_frame)
     button_frame.grid(row=6, column=0, columnspan=3, pady=10)
@@ -402,7 +153,8 @@ def create_gui():
                                 command=lambda: start_download(
                                     api_key_entry, search_entry.get(), num_images_var.get(),
                                     folder_entry.get(), status_label, progress_bar, download_button,
-                                    orientation_var.get(), size_var.get(), color_var.get(), locale_var.get()
+                                    orientation_var.get(), size_var.get(), color_var.get(), locale_var.get(),
+                                    max_workers_var.get()
                                 ))
     download_button.pack(side='left', padx=5)
 
@@ -417,9 +169,39 @@ def create_gui():
 
     root.mainloop()
 
+def download_images(api_key, search_terms, num_images, output_folder,
+                   status_label, progress_bar, orientation=None,
+                   size=None, color=None, locale=None,
+                   max_workers=DEFAULT_DOWNLOAD_WORKERS, cache_path=None):
+    """Run the download core, mirroring its progress events onto the status widgets"""
+
+    if not api_key:
+        status_label.config(text="Invalid API Key")
+        return
+
+    if not search_terms or not output_folder:
+        messagebox.showerror("Error", "Search terms and output folder are required.")
+        return
+
+    def on_progress(event):
+        status_label.config(text=event.message)
+        progress_bar['value'] = event.percent
+
+    try:
+        stats = pexels_core.download_images(
+            api_key, search_terms, num_images, output_folder,
+            orientation=orientation, size=size, color=color, locale=locale,
+            max_workers=max_workers, cache_path=cache_path, on_progress=on_progress
+        )
+    except ValueError:
+        # The authentication error has already been shown through on_progress
+        return
+
+    messagebox.showinfo("Download Complete", pexels_core.format_stats(stats))
+
 def start_download(api_key_entry, search_input, num_images, output_folder,
                   status_label, progress_bar, download_button, orientation="",
-                  size="", color="", locale=""):
+                  size="", color="", locale="", max_workers=DEFAULT_DOWNLOAD_WORKERS):
     """Enhanced download starter with comprehensive parameter support"""
 
     api_key = api_key_entry.get()
@@ -454,8 +236,12 @@ def start_download(api_key_entry, search_input, num_images, output_folder,
         try:
             download_images(
                 api_key, search_terms, num_images, output_folder,
-                status_label, progress_bar, orientation, size, color, locale
+                status_label, progress_bar, orientation, size, color, locale,
+                max_workers
             )
+        except Exception as e:
+            logging.error(f"Download failed: {e}")
+            status_label.config(text=f"Download failed: {e}")
         finally:
             download_button.config(state=tk.NORMAL, text="Start Download")
             progress_bar['value'] = 100
@@ -464,7 +250,7 @@ def start_download(api_key_entry, search_input, num_images, output_folder,
 
     # Save values to registry
     save_to_registry(api_key, search_input, num_images, output_folder,
-                    orientation, size, color, locale)
+                    orientation, size, color, locale, max_workers)
 
 def browse_folder(entry):
     """Browse for output folder"""
@@ -479,7 +265,7 @@ def show_help():
 
 1. API Key: Get your free API key from https://www.pexels.com/api/
 2. Search Terms: Enter terms separated by commas (e.g., "nature, ocean, mountains")
-3. Images per Term: Maximum 80 images per search term
+3. Images per Term: Results beyond 80 are fetched over several pages
 4. Output Folder: Choose where to save downloaded images
 
 Advanced Settings:
@@ -487,19 +273,24 @@ Advanced Settings:
 - Size: large (24MP), medium (12MP), or small (4MP)
 - Color: Filter by dominant color
 - Locale: Search in specific language
+- Download Workers: Number of images fetched in parallel
 
 Rate Limits:
 - 200 requests per hour
 - 20,000 requests per month
 - Images are cached to avoid re-downloads
+- Search results are cached for 24 hours in the output folder
 
 For more information, visit: https://www.pexels.com/api/documentation/"""
 
     messagebox.showinfo("Help", help_text)
 
 def save_to_registry(api_key, search_terms, num_images, output_folder,
-                    orientation="", size="", color="", locale=""):
+                    orientation="", size="", color="", locale="",
+                    max_workers=DEFAULT_DOWNLOAD_WORKERS):
     """Save all settings to Windows registry"""
+    if winreg is None:
+        return
     try:
         with winreg.ConnectRegistry(None, winreg.HKEY_CURRENT_USER) as registry_key:
             with winreg.CreateKey(registry_key, r"Software\PexelsImageDownloader") as key:
@@ -511,6 +302,7 @@ def save_to_registry(api_key, search_terms, num_images, output_folder,
                 winreg.SetValueEx(key, "size", 0, winreg.REG_SZ, size)
                 winreg.SetValueEx(key, "color", 0, winreg.REG_SZ, color)
                 winreg.SetValueEx(key, "locale", 0, winreg.REG_SZ, locale)
+                winreg.SetValueEx(key, "max_workers", 0, winreg.REG_DWORD, max_workers)
         logging.info("Settings saved to registry")
     except Exception as e:
         logging.error(f"Failed to save settings to registry: {e}")
@@ -0,0 +1,153 @@
+"""
+Download manifest kept alongside the images in the output folder
+
+Every downloaded photo is recorded once with its source URL, size and SHA-256,
+together with the search terms that matched it. The index is loaded into memory
+when the manifest is opened, so deduplication is a dictionary lookup rather
+than a stat per photo, and a photo found under a second term is linked to the
+existing file instead of being downloaded again.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional, Set, Tuple
+
+MANIFEST_FILENAME = ".pexels_manifest.sqlite"
+
+
+class DownloadManifest:
+    def __init__(self, output_folder: str, filename: str = MANIFEST_FILENAME):
+        self.root = output_folder
+        self.path = os.path.join(output_folder, filename)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS photos ("
+            "  photo_id INTEGER PRIMARY KEY,"
+            "  url TEXT NOT NULL,"
+            "  path TEXT NOT NULL,"
+            "  size INTEGER,"
+            "  sha256 TEXT,"
+            "  downloaded_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS photo_terms ("
+            "  photo_id INTEGER NOT NULL REFERENCES photos (photo_id),"
+            "  term TEXT NOT NULL,"
+            "  path TEXT NOT NULL,"
+            "  PRIMARY KEY (photo_id, term))"
+        )
+        self._conn.commit()
+
+        # Loaded once; every later check is an in-memory lookup
+        self._paths: Dict[int, str] = dict(
+            self._conn.execute("SELECT photo_id, path FROM photos")
+        )
+        self._terms: Set[Tuple[int, str]] = set(
+            self._conn.execute("SELECT photo_id, term FROM photo_terms")
+        )
+        # Photos being fetched right now, so concurrent terms wait instead of fetching twice
+        self._pending: Dict[int, Future] = {}
+        logging.info(f"Loaded manifest with {len(self._paths)} photos from {self.path}")
+
+    def __contains__(self, photo_id: int) -> bool:
+        return photo_id in self._paths
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def has_term(self, photo_id: int, term: str) -> bool:
+        return (photo_id, term) in self._terms
+
+    def file_path(self, photo_id: int) -> Optional[str]:
+        """Absolute path of the stored copy of photo_id, if it has been downloaded"""
+
+        path = self._paths.get(photo_id)
+        return os.path.join(self.root, path) if path is not None else None
+
+    def claim(self, photo_id: int) -> Tuple[bool, Optional[Future]]:
+        """Reserve photo_id for downloading
+
+        Returns (True, None) if the caller now owns the download and must call
+        release() when it ends, (False, future) if another caller is already
+        downloading it (the future resolves to whether that succeeded), or
+        (False, None) if it has been downloaded in the meantime.
+        """
+
+        with self._lock:
+            if photo_id in self._paths:
+                return False, None
+            if photo_id in self._pending:
+                return False, self._pending[photo_id]
+            self._pending[photo_id] = Future()
+            return True, None
+
+    def release(self, photo_id: int, succeeded: bool):
+        """End a claimed download, waking any callers waiting on it"""
+
+        with self._lock:
+            pending = self._pending.pop(photo_id, None)
+        if pending is not None:
+            pending.set_result(succeeded)
+
+    def record_download(self, photo_id: int, url: str, path: str, term: str,
+                        size: Optional[int] = None, sha256: Optional[str] = None):
+        relpath = os.path.relpath(path, self.root)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO photos (photo_id, url, path, size, sha256, downloaded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (photo_id, url, relpath, size, sha256, time.time())
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO photo_terms (photo_id, term, path) VALUES (?, ?, ?)",
+                (photo_id, term, relpath)
+            )
+            self._conn.commit()
+            self._paths[photo_id] = relpath
+            self._terms.add((photo_id, term))
+
+    def add_term(self, photo_id: int, term: str, path: Optional[str] = None):
+        """Record that an already downloaded photo also matched term
+
+        path is where the term's copy lives (e.g. a hardlink); without one the
+        term refers to the original file.
+        """
+
+        relpath = os.path.relpath(path, self.root) if path else self._paths[photo_id]
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO photo_terms (photo_id, term, path) VALUES (?, ?, ?)",
+                (photo_id, term, relpath)
+            )
+            self._conn.commit()
+            self._terms.add((photo_id, term))
+
+    def link_into(self, photo_id: int, term: str, filename: str) -> bool:
+        """Make an existing download appear under another term without fetching it again
+
+        Tries a hardlink at filename and falls back to a manifest-only reference
+        where links are not supported. Returns True if a link was created.
+        """
+
+        source = self.file_path(photo_id)
+        linked = False
+        if source and not os.path.exists(filename):
+            try:
+                os.link(source, filename)
+                linked = True
+            except OSError as e:
+                logging.debug(f"Could not hardlink {source} to {filename}: {e}")
+
+        self.add_term(photo_id, term, filename if linked or os.path.exists(filename) else None)
+        return linked
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
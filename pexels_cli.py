@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Command line entry point for headless runs
+
+    python -m pexels_cli nature "city lights" -o ./images -n 200
+    python -m pexels_cli --job-file terms.csv -o ./images
+
+The API key is read from --api-key or the PEXELS_API_KEY environment variable.
+Exits with status 1 if the key is rejected or any download failed, so cron
+jobs and batch schedulers can tell a clean run from a partial one.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from typing import List, Optional
+
+from jobs import DEFAULT_SEARCH_WORKERS, load_job_file, run_job
+from pexels_core import (DEFAULT_DOWNLOAD_WORKERS, MAX_DOWNLOAD_WORKERS, ProgressEvent,
+                         download_images, format_stats)
+
+
+def parse_terms(values: List[str]) -> List[str]:
+    """Accept terms as separate arguments, comma-separated lists, or both"""
+
+    return [term.strip() for value in values for term in value.split(",") if term.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pexels_cli",
+        description="Download images from Pexels without the GUI."
+    )
+    parser.add_argument("terms", nargs="*", help="search terms (comma-separated lists are split)")
+    parser.add_argument("-o", "--output", required=True, help="output folder")
+    parser.add_argument("-n", "--num-images", type=int, default=50, help="images per term (default: 50)")
+    parser.add_argument("--api-key", default=os.environ.get("PEXELS_API_KEY"),
+                        help="Pexels API key (default: $PEXELS_API_KEY)")
+    parser.add_argument("--orientation", choices=["landscape", "portrait", "square"])
+    parser.add_argument("--size", choices=["large", "medium", "small"])
+    parser.add_argument("--color", help="dominant color name or hex code")
+    parser.add_argument("--locale", help="search locale, e.g. en-US")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_DOWNLOAD_WORKERS,
+                        help=f"concurrent downloads (1-{MAX_DOWNLOAD_WORKERS}, "
+                             f"default: {DEFAULT_DOWNLOAD_WORKERS})")
+    parser.add_argument("--cache", help="search cache file (default: inside the output folder)")
+
+    job = parser.add_argument_group("batch jobs")
+    job.add_argument("--job-file", help="CSV or JSONL file of terms with per-term counts and filters")
+    job.add_argument("--search-workers", type=int, default=DEFAULT_SEARCH_WORKERS,
+                     help=f"terms searched at once (default: {DEFAULT_SEARCH_WORKERS})")
+    job.add_argument("--checkpoint", help="checkpoint log (default: inside the output folder)")
+
+    parser.add_argument("--log-file", help="also write the log to this file")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only log warnings and errors")
+    return parser
+
+
+def configure_logging(quiet: bool, log_file: Optional[str]):
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    logging.basicConfig(
+        level=logging.WARNING if quiet else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=handlers
+    )
+
+
+def log_progress(event: ProgressEvent):
+    # Per-image events are too chatty for a log; terms and errors are enough
+    if event.kind in ("term", "term_done"):
+        logging.info(f"[{event.percent:5.1f}%] {event.message}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    configure_logging(args.quiet, args.log_file)
+
+    if not args.api_key:
+        parser.error("an API key is required (--api-key or PEXELS_API_KEY)")
+
+    search_terms = parse_terms(args.terms)
+    if not search_terms and not args.job_file:
+        parser.error("at least one non-empty search term or --job-file is required")
+    if search_terms and args.job_file:
+        parser.error("search terms and --job-file are mutually exclusive")
+
+    try:
+        if args.job_file:
+            stats = run_job(
+                args.api_key, load_job_file(args.job_file, args.num_images), args.output,
+                max_workers=args.workers, search_workers=args.search_workers,
+                checkpoint_path=args.checkpoint, cache_path=args.cache,
+                on_progress=log_progress
+            )
+        else:
+            stats = download_images(
+                args.api_key, search_terms, args.num_images, args.output,
+                orientation=args.orientation, size=args.size, color=args.color,
+                locale=args.locale, max_workers=args.workers, cache_path=args.cache,
+                on_progress=log_progress
+            )
+    except ValueError as e:
+        logging.error(str(e))
+        return 1
+
+    print(format_stats(stats))
+    return 1 if stats.failed_downloads else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
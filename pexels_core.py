@@ -0,0 +1,678 @@
+"""
+Download core for the Pexels image downloader
+
+Search, rate limiting, caching and concurrent downloads with no GUI
+dependencies. The tkinter app in main.py and the command line in pexels_cli.py
+are both thin consumers of download_images.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+from typing import Optional, List, Dict, Tuple, Callable, Iterable, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from manifest import DownloadManifest
+from search_cache import SearchCache, SEARCH_CACHE_FILENAME
+
+# Number of concurrent image downloads; the session's connection pool is sized to match
+DEFAULT_DOWNLOAD_WORKERS = 8
+MAX_DOWNLOAD_WORKERS = 32
+
+# The search endpoint returns at most 80 photos per page; more results need pagination
+MAX_PER_PAGE = 80
+MAX_IMAGES_PER_TERM = 8000
+
+# Downloads stream into filename + PART_SUFFIX and are renamed into place once complete
+PART_SUFFIX = '.part'
+
+@dataclass
+class DownloadStats:
+    total_searches: int = 0
+    successful_downloads: int = 0
+    failed_downloads: int = 0
+    skipped_files: int = 0
+    api_calls: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    linked_files: int = 0
+    start_time: Optional[datetime] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def increment(self, counter: str, amount: int = 1):
+        """Thread-safe counter update, for runs that search several terms at once"""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+@dataclass
+class FetchResult:
+    size: int
+    sha256: str
+
+class RateLimiter:
+    """Token bucket that paces API calls and resyncs from X-Ratelimit-* response headers
+
+    While plenty of quota remains, up to ``burst`` calls go out back to back and
+    the bucket refills at calls_per_minute. Once the remaining quota drops below
+    ``low_water`` of the limit, the refill rate and burst size shrink in
+    proportion, but never below the pace that spreads the remaining calls
+    evenly until the reset time. An exhausted quota blocks until it resets.
+
+    The bucket state is guarded by a lock that is never held while sleeping, so
+    one limiter can be shared by worker threads and by coroutines.
+    """
+
+    def __init__(self, calls_per_minute: int = 50, burst: int = 10, low_water: float = 0.1):
+        self.calls_per_minute = calls_per_minute
+        self.base_rate = calls_per_minute / 60.0
+        self.max_burst = max(1, burst)
+        self.low_water = low_water
+        self.rate = self.base_rate
+        self.capacity = float(self.max_burst)
+        self.tokens = float(self.max_burst)
+        self.blocked_until = 0.0
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it"""
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait_time, self.blocked_until - now)
+
+    def wait_if_needed(self):
+        wait_time = self.reserve()
+        if wait_time > 0:
+            logging.debug(f"Rate limiting: waiting {wait_time:.2f} seconds")
+            time.sleep(wait_time)
+
+    def update_from_headers(self, headers):
+        """Resync the bucket with the quota the server reports"""
+
+        try:
+            limit = int(headers['X-Ratelimit-Limit'])
+            remaining = int(headers['X-Ratelimit-Remaining'])
+            reset = int(headers['X-Ratelimit-Reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # X-Ratelimit-Reset is a UNIX timestamp, the bucket runs on the monotonic clock
+            window = max(reset - time.time(), 1.0)
+
+            if remaining <= 0:
+                self.tokens = min(self.tokens, 0.0)
+                self.blocked_until = now + window
+                logging.warning(f"API quota exhausted, pausing searches for {window:.0f}s")
+                return
+
+            self.blocked_until = 0.0
+            fraction = remaining / limit if limit > 0 else 1.0
+            if fraction >= self.low_water:
+                self.rate = self.base_rate
+                self.capacity = float(self.max_burst)
+            else:
+                scale = fraction / self.low_water
+                self.rate = min(self.base_rate, max(self.base_rate * scale, remaining / window))
+                self.capacity = max(1.0, self.max_burst * scale)
+
+            self.tokens = min(self.tokens, self.capacity, float(remaining))
+
+    def block_for(self, seconds: float):
+        """Hold back every caller for ``seconds``, e.g. after a 429 with Retry-After"""
+
+        with self._lock:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + seconds)
+
+class PexelsAPI:
+    BASE_URL = "https://api.pexels.com/v1"
+
+    def __init__(self, api_key: str, pool_size: int = DEFAULT_DOWNLOAD_WORKERS,
+                 cache: Optional[SearchCache] = None):
+        self.api_key = api_key
+        self.headers = {"Authorization": api_key}
+        self.rate_limiter = RateLimiter()
+        self.session = self._create_session(pool_size)
+        self.stats = DownloadStats()
+        self.cache = cache
+
+    def _create_session(self, pool_size: int = DEFAULT_DOWNLOAD_WORKERS) -> requests.Session:
+        session = requests.Session()
+        retry_strategy = Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        # Download workers share this session, so keep one pooled connection per worker
+        adapter = HTTPAdapter(max_retries=retry_strategy,
+                              pool_connections=10,
+                              pool_maxsize=max(pool_size, 10))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def search_photos(self, query: str, per_page: int = MAX_PER_PAGE,
+                     orientation: Optional[str] = None,
+                     size: Optional[str] = None,
+                     color: Optional[str] = None,
+                     locale: Optional[str] = None,
+                     page: int = 1) -> Optional[Dict]:
+
+        params = {
+            "query": query,
+            "per_page": min(per_page, MAX_PER_PAGE)
+        }
+        if page > 1:
+            params['page'] = page
+
+        # Add optional parameters
+        if orientation and orientation in ['landscape', 'portrait', 'square']:
+            params['orientation'] = orientation
+        if size and size in ['large', 'medium', 'small']:
+            params['size'] = size
+        if color:
+            params['color'] = color
+        if locale:
+            params['locale'] = locale
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = SearchCache.make_key(params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.stats.increment('cache_hits')
+                logging.info(f"Using cached results for '{query}' with params: {params}")
+                return cached
+            self.stats.increment('cache_misses')
+
+        self.rate_limiter.wait_if_needed()
+        self.stats.increment('api_calls')
+
+        try:
+            logging.info(f"Searching for '{query}' with params: {params}")
+            response = self.session.get(
+                f"{self.BASE_URL}/search",
+                headers=self.headers,
+                params=params,
+                timeout=30
+            )
+            self.rate_limiter.update_from_headers(response.headers)
+            response.raise_for_status()
+
+            # Check rate limit headers
+            remaining = response.headers.get('X-Ratelimit-Remaining')
+            if remaining and int(remaining) < 10:
+                logging.warning(f"API rate limit remaining: {remaining}")
+
+            data = response.json()
+            if cache_key is not None:
+                self.cache.put(cache_key, data)
+            return data
+
+        except requests.exceptions.HTTPError as e:
+            if response.status_code == 401:
+                raise ValueError("Invalid API key")
+            elif response.status_code == 429:
+                retry_after = response.headers.get('Retry-After')
+                self.rate_limiter.block_for(float(retry_after) if retry_after and retry_after.isdigit() else 60)
+                raise Exception("Rate limit exceeded. Please wait before making more requests.")
+            else:
+                raise Exception(f"API error: {e}")
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Network error: {e}")
+
+    def iter_search_photos(self, query: str, max_results: int,
+                           orientation: Optional[str] = None,
+                           size: Optional[str] = None,
+                           color: Optional[str] = None,
+                           locale: Optional[str] = None) -> Iterator[Dict]:
+        """Yield up to max_results photos, fetching further pages only as they are consumed
+
+        Follows the response's next_page link and stops early once total_results
+        is exhausted, so a term with few matches costs a single API call.
+        """
+
+        per_page = min(max_results, MAX_PER_PAGE)
+        page = 1
+        yielded = 0
+
+        while yielded < max_results:
+            data = self.search_photos(
+                query=query,
+                per_page=per_page,
+                orientation=orientation,
+                size=size,
+                color=color,
+                locale=locale,
+                page=page
+            )
+
+            photos = (data or {}).get("photos") or []
+            if page == 1:
+                logging.info(f"'{query}' has {(data or {}).get('total_results', 0)} results")
+
+            for photo in photos[:max_results - yielded]:
+                yielded += 1
+                yield photo
+
+            total_results = (data or {}).get("total_results", 0)
+            if not photos or not data.get("next_page") or page * per_page >= total_results:
+                break
+            page += 1
+
+def download_photos(photos: Iterable[Dict], term_folder: str, api: PexelsAPI,
+                    executor: ThreadPoolExecutor, limit: Optional[int] = None,
+                    on_progress: Optional[Callable[[int, int], None]] = None,
+                    max_in_flight: int = 2 * DEFAULT_DOWNLOAD_WORKERS,
+                    manifest: Optional[DownloadManifest] = None,
+                    term: Optional[str] = None) -> Tuple[int, int, int]:
+    """Download search results concurrently on a shared worker pool
+
+    photos may be a lazy iterator such as PexelsAPI.iter_search_photos: downloads
+    are submitted as results arrive, so the next page is fetched while the
+    workers are busy with the current one. At most max_in_flight downloads are
+    queued at once to keep memory bounded.
+
+    With a manifest, photos it already lists are skipped without touching the
+    disk, and photos downloaded under another term are hardlinked into
+    term_folder instead of being fetched again. If another term is fetching the
+    same photo right now, this batch waits for that download and links it.
+
+    Returns (downloaded, skipped, failed) counts. Results are collected on the
+    calling thread; DownloadStats and the manifest may be shared by several
+    concurrent callers.
+    """
+
+    counts = {"downloaded": 0, "skipped": 0, "failed": 0}
+    in_flight = {}
+    seen = set()
+    submitted = 0
+    done = 0
+
+    def link_existing(img_id, filename):
+        if not manifest.has_term(img_id, term):
+            if manifest.link_into(img_id, term, filename):
+                api.stats.increment('linked_files')
+        counts["skipped"] += 1
+        api.stats.increment('skipped_files')
+
+    def collect(finished):
+        nonlocal done
+        for future in finished:
+            owned, img_id, img_url, filename = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                logging.error(f"Unexpected download error: {e}")
+                result = None
+
+            if not owned:
+                # Another batch's download of the same photo; result is whether it succeeded
+                if result:
+                    link_existing(img_id, filename)
+                else:
+                    counts["failed"] += 1
+                    api.stats.increment('failed_downloads')
+            elif result:
+                counts["downloaded"] += 1
+                api.stats.increment('successful_downloads')
+                if manifest is not None:
+                    manifest.record_download(img_id, img_url, filename, term,
+                                             size=result.size, sha256=result.sha256)
+            else:
+                counts["failed"] += 1
+                api.stats.increment('failed_downloads')
+
+            if owned and manifest is not None:
+                manifest.release(img_id, bool(result))
+
+            done += 1
+            if on_progress:
+                on_progress(done, submitted)
+
+    try:
+        for photo in islice(photos, limit):
+            img_id = photo["id"]
+            img_url = photo["src"]["original"]
+
+            # Pages can repeat a photo; never fetch the same id twice in one batch
+            if img_id in seen:
+                continue
+            seen.add(img_id)
+
+            # Generate filename
+            img_ext = os.path.splitext(img_url)[1] or '.jpg'
+            filename = os.path.join(term_folder, f"{img_id}{img_ext}")
+
+            if manifest is not None and img_id in manifest:
+                link_existing(img_id, filename)
+                continue
+
+            # Skip if file already exists
+            if os.path.exists(filename):
+                if manifest is not None:
+                    # Adopt files downloaded before the manifest existed
+                    manifest.record_download(img_id, img_url, filename, term,
+                                             size=os.path.getsize(filename))
+                counts["skipped"] += 1
+                api.stats.increment('skipped_files')
+                continue
+
+            owner_download = None
+            if manifest is not None:
+                owned, owner_download = manifest.claim(img_id)
+                if not owned and owner_download is None:
+                    # Finished by another batch since the check above
+                    link_existing(img_id, filename)
+                    continue
+
+            if len(in_flight) >= max_in_flight:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(finished)
+
+            if owner_download is not None:
+                in_flight[owner_download] = (False, img_id, img_url, filename)
+            else:
+                future = executor.submit(fetch_image, img_url, filename, api.session)
+                in_flight[future] = (True, img_id, img_url, filename)
+            submitted += 1
+    finally:
+        # A failed page fetch must not lose the downloads already running. Results
+        # are collected as they finish so claims other batches wait on get released.
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(finished)
+
+    return counts["downloaded"], counts["skipped"], counts["failed"]
+
+@dataclass
+class ProgressEvent:
+    """Progress notification passed to the on_progress callback of download_images
+
+    kind is one of "started", "term", "images", "term_done", "error" or
+    "finished". percent is the overall progress across all search terms.
+    """
+    kind: str
+    message: str
+    term: Optional[str] = None
+    percent: float = 0.0
+    images_done: int = 0
+    images_total: int = 0
+
+def term_folder_name(term: str) -> str:
+    return term.replace('/', '_').replace('\\', '_')
+
+def download_term(api: PexelsAPI, term: str, num_images: int, output_folder: str,
+                  executor: ThreadPoolExecutor, manifest: Optional[DownloadManifest] = None,
+                  orientation: Optional[str] = None, size: Optional[str] = None,
+                  color: Optional[str] = None, locale: Optional[str] = None,
+                  max_in_flight: int = 2 * DEFAULT_DOWNLOAD_WORKERS,
+                  on_progress: Optional[Callable[[int, int], None]] = None) -> Tuple[int, int, int]:
+    """Search one term and download its results into output_folder/<term>
+
+    Search results stream in page by page while earlier pages download.
+    Returns (downloaded, skipped, failed) counts; search errors propagate.
+    """
+
+    term_folder = os.path.join(output_folder, term_folder_name(term))
+    os.makedirs(term_folder, exist_ok=True)
+    api.stats.increment('total_searches')
+
+    photos = api.iter_search_photos(
+        query=term,
+        max_results=num_images,
+        orientation=orientation,
+        size=size,
+        color=color,
+        locale=locale
+    )
+
+    images_downloaded, images_skipped, images_failed = download_photos(
+        photos, term_folder, api, executor,
+        on_progress=on_progress, max_in_flight=max_in_flight,
+        manifest=manifest, term=term
+    )
+
+    if not images_downloaded and not images_skipped and not images_failed:
+        logging.warning(f"No results found for '{term}'")
+
+    # Log results for this term
+    logging.info(f"Completed '{term}': {images_downloaded} downloaded, "
+                f"{images_skipped} skipped, {images_failed} failed")
+
+    return images_downloaded, images_skipped, images_failed
+
+def download_images(api_key: str, search_terms: List[str], num_images: int, output_folder: str,
+                    orientation: Optional[str] = None, size: Optional[str] = None,
+                    color: Optional[str] = None, locale: Optional[str] = None,
+                    max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                    cache_path: Optional[str] = None,
+                    on_progress: Optional[Callable[[ProgressEvent], None]] = None) -> DownloadStats:
+    """Search for every term and download the results into output_folder/<term>
+
+    Progress is reported through on_progress, which is called from the thread
+    running download_images. Raises ValueError for missing arguments or when
+    the API rejects the key; per-term errors are logged and the run continues.
+    Returns the run's DownloadStats.
+    """
+
+    if not api_key:
+        raise ValueError("API Key is required.")
+
+    if not search_terms or not output_folder:
+        raise ValueError("Search terms and output folder are required.")
+
+    def notify(kind, message, **fields):
+        if on_progress:
+            on_progress(ProgressEvent(kind, message, **fields))
+
+    max_workers = max(1, min(int(max_workers), MAX_DOWNLOAD_WORKERS))
+
+    # Create output folder if it doesn't exist
+    os.makedirs(output_folder, exist_ok=True)
+
+    # Initialize API client, reusing search results cached by earlier runs
+    cache = SearchCache(cache_path or os.path.join(output_folder, SEARCH_CACHE_FILENAME))
+    api = PexelsAPI(api_key, pool_size=max_workers, cache=cache)
+    api.stats.start_time = datetime.now()
+    manifest = DownloadManifest(output_folder)
+
+    notify("started", "Starting download process...")
+
+    total_operations = len(search_terms)
+    completed_operations = 0
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pexels-download")
+
+    try:
+        for term in search_terms:
+            term = term.strip()
+            if not term:
+                continue
+
+            percent = (completed_operations / total_operations) * 100
+            notify("term", f"Processing '{term}'...", term=term, percent=percent)
+
+            def report_progress(done, total, term=term, percent=percent):
+                notify("images", f"Processing '{term}': {done}/{total} images",
+                       term=term, percent=percent, images_done=done, images_total=total)
+
+            try:
+                counts = download_term(
+                    api, term, num_images, output_folder, executor, manifest,
+                    orientation=orientation, size=size, color=color, locale=locale,
+                    max_in_flight=2 * max_workers, on_progress=report_progress
+                )
+
+                completed_operations += 1
+                percent = (completed_operations / total_operations) * 100
+                message = f"Completed '{term}'" if any(counts) else f"No results for '{term}'"
+                notify("term_done", message, term=term, percent=percent)
+
+            except ValueError as e:
+                logging.error(f"Authentication error for '{term}': {e}")
+                notify("error", f"Authentication error: {e}", term=term, percent=percent)
+                raise
+            except Exception as e:
+                logging.error(f"Error processing '{term}': {e}")
+                completed_operations += 1
+                notify("error", f"Error processing '{term}': {e}", term=term,
+                       percent=(completed_operations / total_operations) * 100)
+    finally:
+        executor.shutdown(wait=True)
+        cache.close()
+        manifest.close()
+
+    logging.info(format_stats(api.stats))
+    notify("finished", "Download complete!", percent=100.0)
+    return api.stats
+
+def format_stats(stats: DownloadStats) -> str:
+    """Human readable summary of a finished run"""
+
+    duration = datetime.now() - stats.start_time if stats.start_time else None
+
+    stats_message = (f"Download complete!\n"
+                    f"Searches: {stats.total_searches}\n"
+                    f"Downloaded: {stats.successful_downloads}\n"
+                    f"Skipped: {stats.skipped_files} ({stats.linked_files} linked from other terms)\n"
+                    f"Failed: {stats.failed_downloads}\n"
+                    f"API calls: {stats.api_calls}\n"
+                    f"Cached searches: {stats.cache_hits}")
+
+    if duration:
+        stats_message += f"\nDuration: {duration.total_seconds():.1f}s"
+
+    return stats_message
+
+def _expected_size(response: requests.Response, offset: int) -> Optional[int]:
+    """Final file size promised by a 200 or 206 response, if the server sent one"""
+
+    if response.headers.get('Content-Encoding', 'identity') != 'identity':
+        # iter_content decodes the body, so Content-Length would not match what we write
+        return None
+
+    if response.status_code == 206:
+        content_range = response.headers.get('Content-Range', '')
+        # e.g. "bytes 1000-4999/5000"
+        try:
+            byte_range, total = content_range.split(' ', 1)[1].split('/')
+            start = int(byte_range.split('-')[0])
+        except (IndexError, ValueError):
+            raise IOError(f"Malformed Content-Range: {content_range!r}")
+        if start != offset:
+            raise IOError(f"Server resumed at byte {start}, expected {offset}")
+        return int(total) if total != '*' else None
+
+    content_length = response.headers.get('Content-Length')
+    return int(content_length) if content_length and content_length.isdigit() else None
+
+def download_single_image(url: str, filename: str, session: requests.Session,
+                         max_retries: int = 3) -> bool:
+    """Download a single image with retry logic"""
+
+    return fetch_image(url, filename, session, max_retries) is not None
+
+def fetch_image(url: str, filename: str, session: requests.Session,
+                max_retries: int = 3) -> Optional[FetchResult]:
+    """Download a single image, returning its size and SHA-256 or None on failure
+
+    The body streams into a .part file that is renamed over filename only once
+    its size matches Content-Length, so an interrupted download never looks
+    complete. After a network error the next attempt resumes from the bytes
+    already on disk with a Range request; attempts that made progress do not
+    count against max_retries. The checksum is computed as the bytes are
+    written, only a resumed prefix is read back from disk.
+    """
+
+    part_filename = filename + PART_SUFFIX
+    attempt = 0
+    furthest = os.path.getsize(part_filename) if os.path.exists(part_filename) else 0
+
+    while True:
+        offset = os.path.getsize(part_filename) if os.path.exists(part_filename) else 0
+        written = 0
+        try:
+            headers = {'Range': f'bytes={offset}-'} if offset else None
+            response = session.get(url, stream=True, timeout=30, headers=headers)
+
+            if response.status_code == 416:
+                # The part file does not fit the remote file any more, start over
+                os.remove(part_filename)
+                raise IOError("Requested range not satisfiable, restarting download")
+            response.raise_for_status()
+
+            if offset and response.status_code != 206:
+                logging.debug(f"Server ignored Range for {filename}, restarting")
+                offset = 0
+
+            expected_size = _expected_size(response, offset)
+            hasher = _hash_prefix(part_filename, offset)
+
+            with open(part_filename, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        written += len(chunk)
+
+            size = offset + written
+            if expected_size is not None and size > expected_size:
+                os.remove(part_filename)
+                raise IOError(f"Received {size} bytes, more than the expected {expected_size}")
+            if expected_size is not None and size < expected_size:
+                raise IOError(f"Incomplete download: got {size} of {expected_size} bytes")
+
+            os.replace(part_filename, filename)
+            logging.debug(f"Successfully downloaded {filename}")
+            return FetchResult(size=size, sha256=hasher.hexdigest())
+
+        except Exception as e:
+            if offset + written > furthest:
+                furthest = offset + written
+                logging.warning(f"Download of {filename} interrupted after {offset + written} bytes, "
+                                f"resuming: {e}")
+                continue
+
+            attempt += 1
+            logging.warning(f"Attempt {attempt} failed for {filename}: {e}")
+            if attempt < max_retries:
+                time.sleep(2 ** (attempt - 1))  # Exponential backoff
+            else:
+                logging.error(f"Failed to download {filename} after {max_retries} attempts")
+                return None
+
+def _hash_prefix(part_filename: str, offset: int):
+    """SHA-256 state for the first offset bytes of a part file being resumed"""
+
+    hasher = hashlib.sha256()
+    if offset:
+        with open(part_filename, 'rb') as f:
+            remaining = offset
+            while remaining:
+                block = f.read(min(remaining, 1024 * 1024))
+                if not block:
+                    break
+                hasher.update(block)
+                remaining -= len(block)
+    return hasher
@@ -0,0 +1,109 @@
+"""
+Persistent cache of Pexels search responses
+
+Responses are stored in a single SQLite file keyed by the normalized query and
+search filters, so re-running yesterday's terms costs no API quota. Entries
+expire after a TTL and the least recently used ones are evicted once the cache
+holds more than max_entries.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+SEARCH_CACHE_FILENAME = ".pexels_search_cache.sqlite"
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class SearchCache:
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Shared by the download workers; every access is serialised by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            "  key TEXT PRIMARY KEY,"
+            "  response TEXT NOT NULL,"
+            "  created_at REAL NOT NULL,"
+            "  last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS search_cache_last_access ON search_cache (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(params: Dict) -> str:
+        """Build a cache key from search request params, ignoring query case and spacing"""
+
+        normalized = dict(params)
+        normalized["query"] = " ".join(str(params.get("query", "")).lower().split())
+        return json.dumps(normalized, sort_keys=True)
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            response, created_at = row
+            if now - created_at > self.ttl:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                "UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+
+        try:
+            return json.loads(response)
+        except ValueError:
+            logging.warning(f"Discarding corrupt search cache entry: {key}")
+            return None
+
+    def put(self, key: str, response: Dict):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Expired rows go first, then the least recently used beyond max_entries
+        self._conn.execute(
+            "DELETE FROM search_cache WHERE created_at < ?", (time.time() - self.ttl,)
+        )
+        (entries,) = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+        if entries > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM search_cache WHERE key IN ("
+                "  SELECT key FROM search_cache ORDER BY last_access LIMIT ?)",
+                (entries - self.max_entries,)
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+        return entries
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
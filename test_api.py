@@ -6,7 +6,7 @@ Simple test script to verify the Pexels API implementation
 import sys
 import os
 import logging
-from main import PexelsAPI, download_single_image
+from pexels_core import PexelsAPI, download_single_image
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio client against the stub server in conftest.py
+"""
+
+import asyncio
+
+import pytest
+
+from async_api import AsyncPexelsAPI, AsyncRateLimiter, download_photos, download_single_image
+
+
+def make_api(stub_server):
+    api = AsyncPexelsAPI("test-key", max_connections=16)
+    api.BASE_URL = f"{stub_server.url}/v1"
+    api.rate_limiter = AsyncRateLimiter(calls_per_minute=6000)
+    return api
+
+
+def test_async_search_and_download(stub_server, tmp_path):
+    """Paginated async search feeds concurrent streaming downloads"""
+
+    async def run():
+        async with make_api(stub_server) as api:
+            photos = api.iter_search_photos("nature", max_results=100)
+            counts = await download_photos(photos, str(tmp_path), api, max_concurrency=8)
+            return counts, api.stats
+
+    (downloaded, skipped, failed), stats = asyncio.run(run())
+
+    assert (downloaded, skipped, failed) == (100, 0, 0)
+    assert stats.successful_downloads == 100
+    assert stats.api_calls == 2
+    assert stub_server.search_pages == [1, 2]
+    assert (tmp_path / "42.jpeg").read_bytes() == stub_server.image_bytes
+
+
+def test_async_download_counts_skips_and_failures(stub_server, tmp_path):
+    """Existing files are skipped and exhausted retries count as failures"""
+
+    async def photos():
+        yield stub_server.photo(1)
+        yield stub_server.photo(2)
+        yield stub_server.photo(3, path="missing/3")
+
+    (tmp_path / "1.jpeg").write_bytes(b"already here")
+
+    async def run():
+        async with make_api(stub_server) as api:
+            return await download_photos(photos(), str(tmp_path), api), api.stats
+
+    (downloaded, skipped, failed), stats = asyncio.run(run())
+
+    assert (downloaded, skipped, failed) == (1, 1, 1)
+    assert (stats.successful_downloads, stats.skipped_files, stats.failed_downloads) == (1, 1, 1)
+
+
+def test_async_search_retries_transient_errors(stub_server):
+    """5xx responses are retried, a persistent 401 becomes ValueError"""
+
+    stub_server.search_errors = [503, 502]
+
+    async def run():
+        async with make_api(stub_server) as api:
+            data = await api.search_photos("nature", per_page=5)
+            stub_server.search_errors = [401]
+            with pytest.raises(ValueError):
+                await api.search_photos("nature", per_page=5)
+            return data
+
+    data = asyncio.run(run())
+
+    assert [photo["id"] for photo in data["photos"]] == [1, 2, 3, 4, 5]
+
+
+def test_async_download_resumes_after_disconnect(stub_server, tmp_path):
+    stub_server.truncate_images = 1
+    filename = str(tmp_path / "5.jpeg")
+
+    async def run():
+        async with make_api(stub_server) as api:
+            return await download_single_image(f"{stub_server.url}/5.jpeg", filename, api.session)
+
+    assert asyncio.run(run())
+    assert (tmp_path / "5.jpeg").read_bytes() == stub_server.image_bytes
+    assert not (tmp_path / "5.jpeg.part").exists()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+End-to-end tests for the headless command line against the stub server
+"""
+
+import subprocess
+import sys
+
+import pexels_core
+from pexels_cli import main, parse_terms
+
+
+def test_parse_terms_splits_commas():
+    assert parse_terms(["nature, ocean", "city lights", " ,"]) == ["nature", "ocean", "city lights"]
+
+
+def test_cli_downloads_into_term_folders(stub_server, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(pexels_core.PexelsAPI, "BASE_URL", f"{stub_server.url}/v1")
+
+    status = main(["nature,ocean", "-o", str(tmp_path), "-n", "5", "--api-key", "test-key", "-q"])
+
+    assert status == 0
+    assert sorted(p.name for p in (tmp_path / "nature").iterdir()) == [f"{i}.jpeg" for i in range(1, 6)]
+
+    # Both terms return the same stub photos, so the second is linked not fetched
+    assert (tmp_path / "nature" / "3.jpeg").samefile(tmp_path / "ocean" / "3.jpeg")
+    assert "Downloaded: 5" in capsys.readouterr().out
+
+
+def test_core_import_does_not_load_gui():
+    code = "import sys, pexels_core; sys.exit('tkinter' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", code]).returncode == 0
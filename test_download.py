@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the download engine, served by the stub server in conftest.py
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from pexels_core import PexelsAPI, RateLimiter, download_photos, download_single_image
+
+
+def make_api(stub_server):
+    api = PexelsAPI("test-key", pool_size=4)
+    api.BASE_URL = f"{stub_server.url}/v1"
+    api.rate_limiter = RateLimiter(calls_per_minute=6000)
+    return api
+
+
+def test_download_photos_counts(stub_server, tmp_path):
+    """Concurrent batch keeps per-term counts and DownloadStats in step"""
+
+    api = make_api(stub_server)
+    photos = [stub_server.photo(i) for i in range(1, 13)]
+    photos.append(stub_server.photo(99, path="missing/99"))
+    (tmp_path / "1.jpeg").write_bytes(b"already here")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        downloaded, skipped, failed = download_photos(
+            photos, str(tmp_path), api, executor, limit=len(photos)
+        )
+
+    assert (downloaded, skipped, failed) == (11, 1, 1)
+    assert api.stats.successful_downloads == 11
+    assert api.stats.skipped_files == 1
+    assert api.stats.failed_downloads == 1
+    assert (tmp_path / "2.jpeg").read_bytes() == stub_server.image_bytes
+
+
+def test_download_photos_respects_limit(stub_server, tmp_path):
+    """Only the first ``limit`` results are fetched"""
+
+    api = make_api(stub_server)
+    photos = [stub_server.photo(i) for i in range(1, 6)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        downloaded, skipped, failed = download_photos(photos, str(tmp_path), api, executor, limit=3)
+
+    assert (downloaded, skipped, failed) == (3, 0, 0)
+    assert sorted(os.listdir(tmp_path)) == ["1.jpeg", "2.jpeg", "3.jpeg"]
+
+
+def test_iter_search_photos_follows_pages(stub_server, tmp_path):
+    """Pagination stops at total_results and feeds the download pool lazily"""
+
+    api = make_api(stub_server)
+
+    photos = api.iter_search_photos("nature", max_results=500)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        downloaded, skipped, failed = download_photos(photos, str(tmp_path), api, executor)
+
+    assert (downloaded, skipped, failed) == (stub_server.total_results, 0, 0)
+    assert stub_server.search_pages == [1, 2]
+    assert api.stats.api_calls == 2
+
+
+def test_iter_search_photos_stops_at_max_results(stub_server):
+    """Pages beyond max_results are never requested"""
+
+    api = make_api(stub_server)
+
+    ids = [photo["id"] for photo in api.iter_search_photos("nature", max_results=50)]
+
+    assert ids == list(range(1, 51))
+    assert stub_server.search_pages == [1]
+
+
+def test_interrupted_download_resumes_with_range(stub_server, tmp_path):
+    """A dropped connection resumes from the .part file instead of restarting"""
+
+    stub_server.truncate_images = 2
+    session = make_api(stub_server).session
+    filename = str(tmp_path / "7.jpeg")
+
+    assert download_single_image(f"{stub_server.url}/7.jpeg", filename, session)
+
+    assert (tmp_path / "7.jpeg").read_bytes() == stub_server.image_bytes
+    assert not (tmp_path / "7.jpeg.part").exists()
+    assert len(stub_server.requests) == 3
+
+
+def test_failed_download_never_leaves_a_final_file(stub_server, tmp_path):
+    """Only the .part file survives a failure, so the next run does not skip the photo"""
+
+    stub_server.truncate_images = 100
+    stub_server.accept_ranges = False
+    session = make_api(stub_server).session
+    filename = str(tmp_path / "8.jpeg")
+
+    assert not download_single_image(f"{stub_server.url}/8.jpeg", filename, session, max_retries=2)
+    assert not (tmp_path / "8.jpeg").exists()
+    assert (tmp_path / "8.jpeg.part").exists()
+
+    stub_server.truncate_images = 0
+    assert download_single_image(f"{stub_server.url}/8.jpeg", filename, session)
+    assert (tmp_path / "8.jpeg").read_bytes() == stub_server.image_bytes
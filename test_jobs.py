@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for batch job files, shared-queue scheduling and checkpoint restarts
+"""
+
+import json
+
+import pexels_core
+from jobs import JobCheckpoint, JobTerm, load_job_file, run_job
+
+
+def test_load_job_file_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "terms.csv"
+    csv_path.write_text("term,num_images,color\nforest,10,green\nsea,,\n,5,\n")
+    jsonl_path = tmp_path / "terms.jsonl"
+    jsonl_path.write_text(json.dumps({"term": "city", "orientation": "portrait"}) + "\n\n")
+
+    assert load_job_file(str(csv_path), default_num_images=3) == [
+        JobTerm("forest", 10, color="green"),
+        JobTerm("sea", 3),
+    ]
+    assert load_job_file(str(jsonl_path)) == [JobTerm("city", 50, orientation="portrait")]
+
+
+def test_checkpoint_ignores_torn_last_line(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    checkpoint = JobCheckpoint(path)
+    checkpoint.mark_done(JobTerm("forest", 10), 10, 0, 0)
+    checkpoint.close()
+    with open(path, "a") as f:
+        f.write('{"key": "trunc')
+
+    reopened = JobCheckpoint(path)
+    assert JobTerm("forest", 10) in reopened
+    assert JobTerm("forest", 20) not in reopened
+    assert len(reopened) == 1
+
+
+def test_run_job_checkpoints_and_resumes(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(pexels_core.PexelsAPI, "BASE_URL", f"{stub_server.url}/v1")
+    jobs = [JobTerm(f"term {i}", 4) for i in range(6)]
+
+    first = run_job("test-key", jobs[:4], str(tmp_path), max_workers=4, search_workers=3)
+    assert first.total_searches == 4
+    assert first.successful_downloads == 4  # the other terms link to the same stub photos
+
+    # A restart with the full job only works through the terms not yet checkpointed
+    second = run_job("test-key", jobs, str(tmp_path), max_workers=4, search_workers=3)
+    assert second.total_searches == 2
+    assert second.successful_downloads == 0
+    assert second.linked_files == 8
+    assert all((tmp_path / f"term {i}" / "4.jpeg").exists() for i in range(6))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for manifest-based deduplication in download_photos
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from pexels_core import PexelsAPI, download_photos
+from manifest import DownloadManifest
+
+
+def run_term(stub_server, api, manifest, output_folder, term, ids):
+    term_folder = os.path.join(output_folder, term)
+    os.makedirs(term_folder, exist_ok=True)
+    photos = [stub_server.photo(i) for i in ids]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        return download_photos(photos, term_folder, api, executor, manifest=manifest, term=term)
+
+
+def test_manifest_records_checksums_and_links_cross_term_duplicates(stub_server, tmp_path):
+    api = PexelsAPI("test-key")
+    manifest = DownloadManifest(str(tmp_path))
+
+    assert run_term(stub_server, api, manifest, str(tmp_path), "ocean", [1, 2, 3]) == (3, 0, 0)
+    assert run_term(stub_server, api, manifest, str(tmp_path), "beach", [2, 3, 4]) == (1, 2, 0)
+
+    # Photos 2 and 3 were fetched once and hardlinked into the second term
+    image_requests = [path for path in stub_server.requests if not path.startswith("/v1")]
+    assert sorted(image_requests) == ["/1.jpeg", "/2.jpeg", "/3.jpeg", "/4.jpeg"]
+    assert api.stats.linked_files == 2
+    assert os.path.samefile(tmp_path / "ocean" / "2.jpeg", tmp_path / "beach" / "2.jpeg")
+
+    row = manifest._conn.execute(
+        "SELECT url, path, size, sha256 FROM photos WHERE photo_id = 1"
+    ).fetchone()
+    assert row == (f"{stub_server.url}/1.jpeg", os.path.join("ocean", "1.jpeg"),
+                   len(stub_server.image_bytes), hashlib.sha256(stub_server.image_bytes).hexdigest())
+    manifest.close()
+
+
+def test_reopened_manifest_skips_without_downloading(stub_server, tmp_path):
+    api = PexelsAPI("test-key")
+    manifest = DownloadManifest(str(tmp_path))
+    run_term(stub_server, api, manifest, str(tmp_path), "ocean", [1, 2])
+    manifest.close()
+
+    reopened = DownloadManifest(str(tmp_path))
+    requests_before = len(stub_server.requests)
+
+    assert 1 in reopened and reopened.has_term(2, "ocean")
+    assert run_term(stub_server, api, reopened, str(tmp_path), "ocean", [1, 2]) == (0, 2, 0)
+    assert len(stub_server.requests) == requests_before
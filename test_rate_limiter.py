@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the header-driven token bucket in RateLimiter
+"""
+
+import time
+
+from pexels_core import RateLimiter
+
+
+def quota_headers(limit, remaining, reset_in):
+    return {
+        "X-Ratelimit-Limit": str(limit),
+        "X-Ratelimit-Remaining": str(remaining),
+        "X-Ratelimit-Reset": str(int(time.time() + reset_in)),
+    }
+
+
+def test_bursts_while_quota_is_plentiful():
+    """The first ``burst`` calls go out immediately, the next one waits for a refill"""
+
+    limiter = RateLimiter(calls_per_minute=60, burst=5)
+    limiter.update_from_headers(quota_headers(20000, 19000, 3600))
+
+    waits = [limiter.reserve() for _ in range(6)]
+
+    assert waits[:5] == [0.0] * 5
+    assert 0.9 < waits[5] <= 1.0
+
+
+def test_slows_down_as_quota_runs_low():
+    """Below the low-water mark the refill rate and burst shrink with the remaining quota"""
+
+    limiter = RateLimiter(calls_per_minute=60, burst=10, low_water=0.1)
+    limiter.update_from_headers(quota_headers(1000, 50, 3600))
+
+    assert limiter.rate == limiter.base_rate * 0.5
+    assert limiter.capacity == 5.0
+
+    # The remaining calls are still spread no slower than evenly until reset
+    limiter.update_from_headers(quota_headers(1000, 1, 3600))
+    assert limiter.rate >= 1 / 3600
+    assert limiter.capacity == 1.0
+
+
+def test_exhausted_quota_blocks_until_reset():
+    limiter = RateLimiter(calls_per_minute=6000)
+    limiter.update_from_headers(quota_headers(200, 0, 30))
+
+    assert 28 < limiter.reserve() <= 30
+
+    # A fresh window from the server lifts the block
+    limiter.update_from_headers(quota_headers(200, 200, 3600))
+    assert limiter.reserve() < 1
+
+
+def test_missing_headers_are_ignored():
+    limiter = RateLimiter(calls_per_minute=60, burst=3)
+    limiter.update_from_headers({"X-Ratelimit-Remaining": "5"})
+
+    assert limiter.capacity == 3.0
+    assert limiter.reserve() == 0.0
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent search response cache
+"""
+
+import time
+
+from pexels_core import PexelsAPI, RateLimiter
+from search_cache import SearchCache
+
+
+def make_api(stub_server, cache):
+    api = PexelsAPI("test-key", cache=cache)
+    api.BASE_URL = f"{stub_server.url}/v1"
+    api.rate_limiter = RateLimiter(calls_per_minute=6000)
+    return api
+
+
+def test_warm_run_makes_no_api_calls(stub_server, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+
+    cold = make_api(stub_server, SearchCache(path))
+    cold_ids = [photo["id"] for photo in cold.iter_search_photos("Nature", max_results=100)]
+    cold.cache.close()
+
+    # A fresh client over the same file, with the query spelled differently
+    warm = make_api(stub_server, SearchCache(path))
+    warm_ids = [photo["id"] for photo in warm.iter_search_photos("  nature ", max_results=100)]
+
+    assert warm_ids == cold_ids
+    assert (cold.stats.api_calls, cold.stats.cache_misses) == (2, 2)
+    assert (warm.stats.api_calls, warm.stats.cache_hits) == (0, 2)
+    assert stub_server.search_pages == [1, 2]
+
+
+def test_filters_are_part_of_the_key(tmp_path):
+    cache = SearchCache(str(tmp_path / "cache.sqlite"))
+    cache.put(SearchCache.make_key({"query": "sea", "per_page": 80}), {"photos": [1]})
+
+    assert cache.get(SearchCache.make_key({"query": "SEA", "per_page": 80})) == {"photos": [1]}
+    assert cache.get(SearchCache.make_key({"query": "sea", "per_page": 80, "color": "blue"})) is None
+    assert cache.get(SearchCache.make_key({"query": "sea", "per_page": 80, "page": 2})) is None
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = SearchCache(str(tmp_path / "cache.sqlite"), ttl=0.05)
+    cache.put("key", {"photos": []})
+    time.sleep(0.1)
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = SearchCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.put("a", {"n": 1})
+    time.sleep(0.01)
+    cache.put("b", {"n": 2})
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.put("c", {"n": 3})
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}